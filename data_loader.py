@@ -0,0 +1,87 @@
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import orjson as json_lib
+except ImportError:
+    import json as json_lib
+
+CSV_PATH = Path('phase_diagram_results.csv')
+JSON_PATH = Path('phase_diagram_results.json')
+
+
+def _read_json_results(path):
+    """Read the 'results' records of the simulation JSON into a DataFrame"""
+    with open(path, 'rb') as f:
+        data = json_lib.loads(f.read())
+    return pd.DataFrame(data['results'])
+
+
+def _load_cached(source, cache, reader):
+    """Read source through a parquet cache that is rebuilt whenever source is newer.
+
+    Densities are snapped to the simulation grid on every load, so they can be
+    matched exactly whatever version of the code wrote the cache.
+    """
+    if cache.exists() and cache.stat().st_mtime >= source.stat().st_mtime:
+        df = pd.read_parquet(cache)
+    else:
+        df = reader(source)
+        # Write to a per-process temp file next to the cache and rename it into
+        # place so that a concurrently starting script never reads a half-written
+        # cache; the file is created normally so it gets the usual umask mode
+        tmp = cache.with_name(f'{cache.name}.{os.getpid()}.tmp')
+        try:
+            df.to_parquet(tmp, engine='pyarrow')
+            os.replace(tmp, cache)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    df['density'] = df['density'].round(3)
+    return df
+
+
+@lru_cache(maxsize=None)
+def load_df():
+    """Load phase_diagram_results.csv (camelCase columns)"""
+    return _load_cached(CSV_PATH, Path('phase_diagram_results.parquet'), pd.read_csv)
+
+
+@lru_cache(maxsize=None)
+def load_results():
+    """Load the results of phase_diagram_results.json (snake_case columns)"""
+    return _load_cached(JSON_PATH, Path('phase_diagram_results_json.parquet'), _read_json_results)
+
+
+def pivot_getter(df, ratio_col):
+    """Return get_pivot(T, metric) giving the ratio x density table of metric at T.
+
+    The data is indexed by (temptation, ratio, density) and sorted once, so each
+    temptation is a contiguous xs slice; when ratio and density form a complete
+    grid without duplicates, each table is a plain reshape of that slice,
+    computed on first use. Anything else goes through unstack, which raises on
+    duplicate entries.
+    """
+    indexed = df.set_index(['temptation', ratio_col, 'density']).sort_index()
+    grouped = {}
+    for T in indexed.index.unique('temptation'):
+        sub = indexed.xs(T, level='temptation')
+        grouped[T] = (sub, sub.index.unique(ratio_col), sub.index.unique('density'))
+    pivot_cache = {}
+
+    def get_pivot(T, metric):
+        key = (T, metric)
+        if key not in pivot_cache:
+            sub, ratios, densities = grouped[T]
+            if sub.index.is_unique and len(sub) == len(ratios) * len(densities):
+                values = sub[metric].to_numpy().reshape(len(ratios), len(densities))
+                pivot_cache[key] = pd.DataFrame(values, index=ratios, columns=densities)
+            else:
+                pivot_cache[key] = sub[metric].unstack('density')
+        return pivot_cache[key]
+
+    return get_pivot
@@ -1,47 +1,40 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
 import seaborn as sns
-import json
 from pathlib import Path
 
+from data_loader import load_results, pivot_getter
+from plot_utils import ANNOT_THRESHOLD, DPI, parse_dpi, reused_figure, run_plots, save_figure
+
 # Create output directory
 output_dir = Path("combined_phase_plots")
 output_dir.mkdir(exist_ok=True)
 
 # Read data
-with open('phase_diagram_results.json', 'r') as f:
-    data = json.load(f)
-    df = pd.DataFrame(data['results'])
+df = load_results()
+get_pivot = pivot_getter(df, 'defector_ratio')
 
 def plot_combined_view(metric, title, T_value):
     """Create a combined view with heatmap and line plots"""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 8))
+    fig = reused_figure((20, 8))
+    ax1, ax2 = fig.subplots(1, 2)
     
     # Heatmap
-    data = df[df['temptation'] == T_value]
-    pivot = data.pivot(
-        index='defector_ratio',
-        columns='density',
-        values=metric
-    )
+    pivot = get_pivot(T_value, metric)
     
-    sns.heatmap(pivot, cmap='RdYlBu_r', annot=True, fmt='.2f',
-                xticklabels=True, yticklabels=True, ax=ax1)
+    sns.heatmap(pivot, cmap='RdYlBu_r', annot=pivot.size < ANNOT_THRESHOLD, fmt='.2f',
+                xticklabels=True, yticklabels=True, ax=ax1, rasterized=True)
     
     ax1.set_title(f'Phase Diagram (T={T_value})')
     ax1.set_xlabel('Density (N/area)')
     ax1.set_ylabel('Defector Ratio')
     
-    # Line plots for selected densities
+    # Line plots for selected densities, read as columns of the pivot
     densities = [0.2, 0.5, 0.8]  # Selected densities
     
     for density in densities:
-        data_slice = df[
-            (df['temptation'] == T_value) & 
-            (np.abs(df['density'] - density) < 0.01)
-        ]
-        ax2.plot(data_slice['defector_ratio'], data_slice[metric], 
+        # Densities missing from the grid have no line to draw
+        if round(density, 3) not in pivot.columns:
+            continue
+        ax2.plot(pivot.index, pivot[round(density, 3)], 
                 'o-', label=f'Density = {density}')
     
     ax2.set_xlabel('Defector Ratio')
@@ -50,9 +43,7 @@ def plot_combined_view(metric, title, T_value):
     ax2.legend()
     ax2.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(output_dir / f'combined_{metric}_T{T_value}.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    save_figure(fig, output_dir / f'combined_{metric}_T{T_value}.png')
 
 # Plot combined views for different metrics and T values
 metrics = {
@@ -64,8 +55,15 @@ metrics = {
 
 T_values = [1.1, 1.7, 2.0]  # Selected T values for comparison
 
-for metric, title in metrics.items():
-    for T in T_values:
-        plot_combined_view(metric, title, T)
+def tasks():
+    """Return the independent (plot, *args) jobs of this script"""
+    return [(plot_combined_view, metric, title, T)
+            for metric, title in metrics.items() for T in T_values]
+
+def run(dpi=DPI):
+    """Render every plot of this script in parallel"""
+    run_plots(tasks(), dpi)
+    print("Combined phase transition plots have been saved to 'combined_phase_plots' directory.")
 
-print("Combined phase transition plots have been saved to 'combined_phase_plots' directory.") 
\ No newline at end of file
+if __name__ == '__main__':
+    run(parse_dpi())
@@ -1,4 +1,3 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
@@ -6,17 +5,25 @@ import seaborn as sns
 from pathlib import Path
 from scipy.ndimage import gaussian_filter1d
 
+from data_loader import load_df, pivot_getter
+from plot_utils import ANNOT_THRESHOLD, DPI, parse_dpi, reused_figure, run_plots, save_figure
+
 # Create output directory
 output_dir = Path("improved_visualizations")
 output_dir.mkdir(exist_ok=True)
 
 # Read data
-df = pd.read_csv('phase_diagram_results.csv')
+df = load_df()
+get_pivot = pivot_getter(df, 'defectorRatio')
 
-def plot_subplots_by_groups(metric, title, t_value=1.7):
+def plot_subplots_by_groups(pivot, metric, title, t_value):
     """Create subplots by grouping defector ratios"""
-    # Filter data
-    data = df[df['temptation'] == t_value]
+    # Smooth every ratio's curve and find its first 0.5 crossing in one pass
+    x = pivot.columns.values
+    Y = pivot.values
+    Y_smooth = gaussian_filter1d(Y, sigma=1, axis=1)
+    above = Y_smooth >= 0.5
+    thresh_idx = np.where(above.any(axis=1), above.argmax(axis=1), -1)
     
     # Group defector ratios
     low = [0.1, 0.2, 0.3]
@@ -24,24 +31,20 @@ def plot_subplots_by_groups(metric, title, t_value=1.7):
     high = [0.7, 0.8, 0.9]
     groups = [('Low', low), ('Medium', mid), ('High', high)]
     
-    fig, axes = plt.subplots(1, 3, figsize=(20, 6))
-    fig.suptitle(f'{title} (T={t_value})', fontsize=16, y=1.05)
+    fig = reused_figure((20, 6))
+    axes = fig.subplots(1, 3)
+    fig.suptitle(f'{title} (T={t_value})', fontsize=16)
     
     for (name, ratios), ax in zip(groups, axes):
         for ratio in ratios:
-            subset = data[data['defectorRatio'] == ratio]
-            x = subset['density'].values
-            y = subset[metric].values
-            y_smooth = gaussian_filter1d(y, sigma=1)
+            i = pivot.index.get_loc(ratio)
             
-            ax.plot(x, y_smooth, '-', label=f'Ratio = {ratio}')
-            ax.plot(x, y, 'o', alpha=0.5)
+            ax.plot(x, Y_smooth[i], '-', label=f'Ratio = {ratio}')
+            ax.plot(x, Y[i], 'o', alpha=0.5)
             
             # 0.5 threshold
-            if metric.endswith('Prob'):
-                thresh_idx = np.where(y_smooth >= 0.5)[0]
-                if len(thresh_idx) > 0:
-                    ax.axvline(x=x[thresh_idx[0]], color='gray', linestyle='--', alpha=0.3)
+            if metric.endswith('Prob') and thresh_idx[i] >= 0:
+                ax.axvline(x=x[thresh_idx[i]], color='gray', linestyle='--', alpha=0.3)
         
         ax.set_title(f'{name} Defector Ratios')
         ax.set_xlabel('Density (N/area)')
@@ -49,50 +52,30 @@ def plot_subplots_by_groups(metric, title, t_value=1.7):
         ax.grid(True, alpha=0.3)
         ax.legend()
     
-    plt.tight_layout()
-    plt.savefig(output_dir / f'subplots_{metric}_T{t_value}.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    save_figure(fig, output_dir / f'subplots_{metric}_T{t_value}.png')
 
-def plot_heatmap(metric, title, t_value=1.7):
+def plot_heatmap(pivot, metric, title, t_value):
     """Create heatmap visualization"""
-    # Convert data to pivot table
-    data = df[df['temptation'] == t_value]
-    pivot = data.pivot(
-        index='defectorRatio',
-        columns='density',
-        values=metric
-    )
-    
-    plt.figure(figsize=(12, 8))
-    sns.heatmap(pivot, cmap='RdYlBu_r', annot=True, fmt='.2f',
-                xticklabels=True, yticklabels=True)
+    fig = reused_figure((12, 8))
+    ax = fig.subplots()
+    sns.heatmap(pivot, cmap='RdYlBu_r', annot=pivot.size < ANNOT_THRESHOLD, fmt='.2f',
+                xticklabels=True, yticklabels=True, ax=ax, rasterized=True)
     
-    plt.title(f'{title}\nT={t_value}')
-    plt.xlabel('Density (N/area)')
-    plt.ylabel('Defector Ratio')
+    ax.set_title(f'{title}\nT={t_value}')
+    ax.set_xlabel('Density (N/area)')
+    ax.set_ylabel('Defector Ratio')
     
-    plt.savefig(output_dir / f'heatmap_{metric}_T{t_value}.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    save_figure(fig, output_dir / f'heatmap_{metric}_T{t_value}.png')
 
-def plot_3d_surface(metric, title, t_value=1.7):
+def plot_3d_surface(pivot, metric, title, t_value):
     """Create 3D surface plot"""
-    data = df[df['temptation'] == t_value]
-    
     # Create mesh grid
-    X = data['density'].unique()
-    Y = data['defectorRatio'].unique()
-    X, Y = np.meshgrid(X, Y)
-    
-    # Calculate Z values
-    pivot = data.pivot(
-        index='defectorRatio',
-        columns='density',
-        values=metric
-    )
+    X, Y = np.meshgrid(pivot.columns, pivot.index)
     Z = pivot.values
     
-    # 3D plot
-    fig = plt.figure(figsize=(12, 8))
+    # 3D plot (constrained layout is unreliable with 3D axes, and a reused
+    # figure keeps 3D state between surfaces, so each gets a fresh figure)
+    fig = plt.figure(figsize=(12, 8), layout='none')
     ax = fig.add_subplot(111, projection='3d')
     
     # Plot surface
@@ -111,8 +94,22 @@ def plot_3d_surface(metric, title, t_value=1.7):
     # Add colorbar
     fig.colorbar(surf, ax=ax, shrink=0.5, aspect=5)
     
-    plt.savefig(output_dir / f'surface3d_{metric}_T{t_value}.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    save_figure(fig, output_dir / f'surface3d_{metric}_T{t_value}.png', bbox_inches='tight')
+    plt.close(fig)
+
+def plot_metric(metric, title, t_value=1.7):
+    """Create all three visualizations of a metric from one shared pivot table"""
+    print(f"\nCreating visualizations for {title}...")
+    pivot = get_pivot(t_value, metric)
+    
+    # 1. Grouped subplots
+    plot_subplots_by_groups(pivot, metric, title, t_value)
+    
+    # 2. Heatmap
+    plot_heatmap(pivot, metric, title, t_value)
+    
+    # 3. 3D surface
+    plot_3d_surface(pivot, metric, title, t_value)
 
 # Analyze metrics
 metrics = {
@@ -122,17 +119,14 @@ metrics = {
     'avgCompliance': 'Final Compliance Rate'
 }
 
-# Create three different visualizations for each metric
-for metric, title in metrics.items():
-    print(f"\nCreating visualizations for {title}...")
-    
-    # 1. Grouped subplots
-    plot_subplots_by_groups(metric, title)
-    
-    # 2. Heatmap
-    plot_heatmap(metric, title)
-    
-    # 3. 3D surface
-    plot_3d_surface(metric, title)
+def tasks():
+    """Return the independent (plot, *args) jobs of this script, one per metric"""
+    return [(plot_metric, metric, title) for metric, title in metrics.items()]
+
+def run(dpi=DPI):
+    """Render every plot of this script in parallel"""
+    run_plots(tasks(), dpi)
+    print("\nAll visualizations have been saved to 'improved_visualizations' directory.")
 
-print("\nAll visualizations have been saved to 'improved_visualizations' directory.") 
\ No newline at end of file
+if __name__ == '__main__':
+    run(parse_dpi())
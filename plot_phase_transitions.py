@@ -1,37 +1,37 @@
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import json
 from pathlib import Path
 
+from data_loader import load_results, pivot_getter
+from plot_utils import DPI, parse_dpi, reused_figure, run_plots, save_figure
+
 # Create output directory
 output_dir = Path("phase_transition_plots")
 output_dir.mkdir(exist_ok=True)
 
 # Read data
-with open('phase_diagram_results.json', 'r') as f:
-    data = json.load(f)
-    df = pd.DataFrame(data['results'])
+df = load_results()
+get_pivot = pivot_getter(df, 'defector_ratio')
 
 def plot_phase_diagram_heatmaps(metric, title):
     """Create heatmaps for different T values showing phase transitions"""
-    fig, axes = plt.subplots(2, 3, figsize=(20, 12))
-    axes = axes.flatten()
+    fig = reused_figure((20, 12))
+    axes = fig.subplots(2, 3).flatten()
     
     T_values = sorted(df['temptation'].unique())
+    pivots = [get_pivot(T, metric) for T in T_values]
     
-    for i, T in enumerate(T_values):
-        data = df[df['temptation'] == T]
-        pivot = data.pivot(
-            index='defector_ratio',
-            columns='density',
-            values=metric
-        )
-        
-        sns.heatmap(pivot, cmap='RdYlBu_r', annot=False, fmt='.2f',
-                    xticklabels=True, yticklabels=True, ax=axes[i])
+    # All panels share one color scale so a single colorbar covers them
+    vmin = min(np.nanmin(pivot.values) for pivot in pivots)
+    vmax = max(np.nanmax(pivot.values) for pivot in pivots)
+    
+    for i, (T, pivot) in enumerate(zip(T_values, pivots)):
+        mesh = axes[i].pcolormesh(pivot.columns, pivot.index, pivot.values,
+                                  cmap='RdYlBu_r', shading='nearest',
+                                  vmin=vmin, vmax=vmax, rasterized=True)
         
+        axes[i].set_xticks(pivot.columns)
+        axes[i].set_yticks(pivot.index)
+        axes[i].invert_yaxis()
         axes[i].set_title(f'T = {T}')
         axes[i].set_xlabel('Density (N/area)')
         axes[i].set_ylabel('Defector Ratio')
@@ -40,33 +40,33 @@ def plot_phase_diagram_heatmaps(metric, title):
         for i in range(len(T_values), len(axes)):
             fig.delaxes(axes[i])
     
-    plt.suptitle(f'{title} Phase Diagram', fontsize=16, y=1.02)
-    plt.tight_layout()
-    plt.savefig(output_dir / f'phase_diagram_{metric}.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.colorbar(mesh, ax=axes[:len(T_values)].tolist(), shrink=0.7)
+    
+    fig.suptitle(f'{title} Phase Diagram', fontsize=16)
+    save_figure(fig, output_dir / f'phase_diagram_{metric}.png')
 
 def plot_metric_vs_defector_ratio(metric, title):
     """Plot metric vs defector ratio for different densities"""
-    plt.figure(figsize=(12, 8))
+    fig = reused_figure((12, 8))
+    ax = fig.subplots()
     
     densities = [0.2, 0.5, 0.8]  # Selected densities
     T = 1.7  # Fixed T value
+    pivot = get_pivot(T, metric)
     
     for density in densities:
-        data = df[
-            (df['temptation'] == T) & 
-            (np.abs(df['density'] - density) < 0.01)
-        ]
-        plt.plot(data['defector_ratio'], data[metric], 
+        # Densities missing from the grid have no line to draw
+        if round(density, 3) not in pivot.columns:
+            continue
+        ax.plot(pivot.index, pivot[round(density, 3)], 
                 'o-', label=f'Density = {density}')
     
-    plt.xlabel('Defector Ratio')
-    plt.ylabel(metric)
-    plt.title(f'{title} vs Defector Ratio (T={T})')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.savefig(output_dir / f'{metric}_vs_defector_ratio.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    ax.set_xlabel('Defector Ratio')
+    ax.set_ylabel(metric)
+    ax.set_title(f'{title} vs Defector Ratio (T={T})')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    save_figure(fig, output_dir / f'{metric}_vs_defector_ratio.png')
 
 # Plot phase diagrams for different metrics
 metrics = {
@@ -76,8 +76,16 @@ metrics = {
     'avg_largest_cluster_frac': 'Average Largest Cluster Fraction'
 }
 
-for metric, title in metrics.items():
-    plot_phase_diagram_heatmaps(metric, title)
-    plot_metric_vs_defector_ratio(metric, title)
+def tasks():
+    """Return the independent (plot, *args) jobs of this script"""
+    return [(plot, metric, title)
+            for metric, title in metrics.items()
+            for plot in (plot_phase_diagram_heatmaps, plot_metric_vs_defector_ratio)]
+
+def run(dpi=DPI):
+    """Render every plot of this script in parallel"""
+    run_plots(tasks(), dpi)
+    print("Phase transition plots have been saved to 'phase_transition_plots' directory.")
 
-print("Phase transition plots have been saved to 'phase_transition_plots' directory.") 
\ No newline at end of file
+if __name__ == '__main__':
+    run(parse_dpi())
@@ -0,0 +1,12 @@
+import plot_combined_transitions
+import plot_improved_visualization
+import plot_phase_transitions
+from plot_utils import parse_dpi, run_plots
+
+modules = [plot_combined_transitions, plot_phase_transitions, plot_improved_visualization]
+
+if __name__ == '__main__':
+    # One interpreter and one worker pool for the jobs of every plotting script
+    run_plots([task for module in modules for task in module.tasks()], parse_dpi())
+
+    print("All plots have been saved.")